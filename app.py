@@ -4,21 +4,28 @@ Streamlit application for Quran Audio Scraper
 
 import streamlit as st
 import os
-import json
-import asyncio
-import threading
-import time
 from datetime import datetime
-from pathlib import Path
-import pandas as pd
 import queue
-import sys
+import threading
+import weakref
+import heapq
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
 import re
-from urllib.parse import urlparse
 
-from downloader import QuranAudioDownloader
-from constants import MESSAGES, DEFAULT_DOWNLOAD_DIR
-from utils import format_file_size, format_duration
+from constants import (
+    AUDIO_EXTENSION, CONCURRENT_DOWNLOADS, DEFAULT_DOWNLOAD_DIR, MAX_CONCURRENT_DOWNLOADS,
+    PROGRESS_UPDATE_INTERVAL, LOG_TAIL_LINES, LOG_TAIL_BYTES, SIDEBAR_PROGRESS_TTL, URL_HISTORY_SIZE
+)
+from utils import (
+    AggregatingProgressUpdater, SurahRecord, format_file_size, format_duration, get_surah_list,
+    get_surah_folder_name, load_quran_data
+)
+
+if TYPE_CHECKING:
+    from downloader import QuranAudioDownloader
 
 
 # Page configuration - Force light mode
@@ -29,263 +36,180 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
 # FIXED CSS - Using proper Streamlit CSS injection with higher specificity
-st.markdown("""
-<style>
-    /* Force light mode with higher specificity */
-    .stApp {
-        color: #262730 !important;
-        background-color: #ffffff !important;
-    }
-    
-    .stApp > header {
-        background-color: #ffffff !important;
-    }
-    
-    .stSidebar {
-        background-color: #f8f9fa !important;
-    }
-    
-    .stSidebar .stSelectbox > div > div {
-        background-color: #ffffff !important;
-    }
-    
-    .stSidebar .stTextInput > div > div > input {
-        background-color: #ffffff !important;
-    }
-    
-    .stSidebar .stButton > button {
-        background-color: #ffffff !important;
-        color: #262730 !important;
-        border: 1px solid #d1d5db !important;
-    }
-    
-    .stSidebar .stButton > button:hover {
-        background-color: #f3f4f6 !important;
-    }
-    
-    /* FIXED: Custom container styles with higher specificity */
-    .main-header {
-        text-align: center !important;
-        color: #2E8B57 !important;
-        margin-bottom: 2rem !important;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.1) !important;
-        font-size: 2.5rem !important;
-        font-weight: bold !important;
-    }
-    
-    .stats-container {
-        background: linear-gradient(135deg, #f0f2f6 0%, #e8eaf6 100%) !important;
-        padding: 1.5rem !important;
-        border-radius: 1rem !important;
-        margin: 1rem 0 !important;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1) !important;
-        border: 1px solid #e0e0e0 !important;
-    }
-    
-    .progress-container {
-        background: linear-gradient(135deg, #e8f4fd 0%, #e3f2fd 100%) !important;
-        padding: 1.5rem !important;
-        border-radius: 1rem !important;
-        margin: 1rem 0 !important;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1) !important;
-        border: 1px solid #bbdefb !important;
-    }
-    
-    .log-container {
-        background-color: #f8f9fa !important;
-        padding: 1rem !important;
-        border-radius: 0.5rem !important;
-        max-height: 400px !important;
-        overflow-y: auto !important;
-        border: 1px solid #dee2e6 !important;
-    }
-    
-    .options-container {
-        background: linear-gradient(135deg, #fff3cd 0%, #ffeaa7 100%) !important;
-        padding: 1.5rem !important;
-        border-radius: 1rem !important;
-        margin: 1rem 0 !important;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1) !important;
-        border: 1px solid #ffc107 !important;
-    }
-    
-    .metric-success {
-        color: #28a745 !important;
-        font-weight: bold !important;
-    }
-    
-    .metric-danger {
-        color: #dc3545 !important;
-        font-weight: bold !important;
-    }
-    
-    .metric-warning {
-        color: #ffc107 !important;
-        font-weight: bold !important;
-    }
-    
-    .metric-info {
-        color: #17a2b8 !important;
-        font-weight: bold !important;
-    }
-    
-    .progress-text {
-        font-size: 1.2rem !important;
-        font-weight: bold !important;
-        color: #2E8B57 !important;
-    }
-    
-    .status-text {
-        font-size: 1rem !important;
-        color: #666 !important;
-        font-style: italic !important;
-    }
-    
-    .stProgress > div > div > div > div {
-        background: linear-gradient(90deg, #28a745 0%, #20c997 50%, #17a2b8 100%) !important;
-    }
-    
-    /* Force light mode for all components */
-    .stSelectbox > div > div {
-        background-color: #ffffff !important;
-    }
-    
-    .stTextInput > div > div > input {
-        background-color: #ffffff !important;
-    }
-    
-    .stButton > button {
-        background-color: #ffffff !important;
-        color: #262730 !important;
-        border: 1px solid #d1d5db !important;
-    }
-    
-    .stButton > button:hover {
-        background-color: #f3f4f6 !important;
-    }
-    .stTabs [data-baseweb="tab"] {
-        background-color: #ffffff !important;
-        color: #262730 !important;
-        padding: 0.5rem 1rem !important;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: #f0f2f6 !important;
-    }
-    
-    /* Hide Streamlit footer */
-    footer {
-        display: none !important;
-    }
-    
-    /* Custom footer styling */
-    .custom-footer {
-        position: fixed !important;
-        left: 0 !important;
-        bottom: 0 !important;
-        width: 100% !important;
-        background-color: #f8f9fa !important;
-        color: #222 !important;
-        text-align: center !important;
-        padding: 10px 0 !important;
-        font-size: 15px !important;
-        z-index: 9999 !important;
-        border-top: 1px solid #e0e0e0 !important;
-    }
-    
-    .custom-footer a {
-        color: #228B22 !important;
-        text-decoration: underline !important;
-        font-weight: 500 !important;
-    }
-    [data-baseweb="tab-panel"] {
-        margin-top: 1rem;
-        padding: 1rem;
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        background: #f7f7f7;
-    }
- 
-    .e1nzilvr3 {
-        display: none;
-     }
-</style>
-""", unsafe_allow_html=True)
+APP_CSS_PATH = Path(__file__).with_name("app.css")
+
+
+@st.cache_resource(show_spinner=False)
+def load_app_css() -> str:
+    """Read and minify the app stylesheet once per process; main() injects the cached string"""
+    css = APP_CSS_PATH.read_text(encoding='utf-8')
+    # Comments and indentation only matter in the source file, not in every page payload
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css).strip()
+    return f"<style>{css}</style>"
+
+
+# Static footer markup - Streamlit clears elements a rerun doesn't emit, so it is sent with the CSS every run
+FOOTER_HTML = (
+    '<div class="custom-footer">'
+    '© 2025 Quran Audio Scraper | Powered by '
+    '<a href="https://github.com/code-abdulrehman">Abdulrehman</a>'
+    '</div>'
+)
+
+
+# Session state defaults in initialization order; callables are factories so every
+# session gets its own mutable objects instead of sharing one module-level instance
+SESSION_STATE_DEFAULTS = (
+    ('downloader', None),
+    ('download_in_progress', False),
+    ('download_progress', 0),
+    ('download_message', ""),
+    ('download_counts', (0, 0)),
+    ('download_stats', dict),
+    ('progress_queue', queue.SimpleQueue),
+    # One long-lived worker thread per session instead of a new thread per download
+    ('download_worker', lambda: DownloadWorker()),
+    ('current_url', ""),
+    # Backing value of the keyed URL text_input, so history clicks can fill it in place
+    ('url_input', ""),
+    # Bounded, so long sessions keep only the most recent URLs
+    ('url_history', partial(deque, maxlen=URL_HISTORY_SIZE)),
+    ('download_type', "word_by_word"),
+    ('download_options', lambda: {
+        'start_verse': None,
+        'end_verse': None,
+        'start_word': None,
+        'end_word': None,
+        'resume': True
+    }),
+    ('current_surah', None),
+    ('current_verse', None),
+    ('current_word', None),
+)
 
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'downloader' not in st.session_state:
-        st.session_state.downloader = None
-    if 'download_in_progress' not in st.session_state:
-        st.session_state.download_in_progress = False
-    if 'download_progress' not in st.session_state:
-        st.session_state.download_progress = 0
-    if 'download_message' not in st.session_state:
-        st.session_state.download_message = ""
-    if 'download_stats' not in st.session_state:
-        st.session_state.download_stats = {}
-    if 'logs' not in st.session_state:
-        st.session_state.logs = []
-    if 'progress_queue' not in st.session_state:
-        st.session_state.progress_queue = queue.Queue()
-    if 'download_thread' not in st.session_state:
-        st.session_state.download_thread = None
-    if 'current_url' not in st.session_state:
-        st.session_state.current_url = ""
-    if 'url_history' not in st.session_state:
-        st.session_state.url_history = []
-    if 'download_type' not in st.session_state:
-        st.session_state.download_type = "word_by_word"
-    if 'download_options' not in st.session_state:
-        st.session_state.download_options = {
-            'start_verse': None,
-            'end_verse': None,
-            'start_word': None,
-            'end_word': None,
-            'resume': True
-        }
-    if 'current_surah' not in st.session_state:
-        st.session_state.current_surah = None
-    if 'current_verse' not in st.session_state:
-        st.session_state.current_verse = None
-    if 'current_word' not in st.session_state:
-        st.session_state.current_word = None
+    session_state = st.session_state
+    for key, default in SESSION_STATE_DEFAULTS:
+        if key not in session_state:
+            session_state[key] = default() if callable(default) else default
+
+
+@st.cache_resource(show_spinner=False)
+def load_surah_records() -> tuple:
+    """Load the static surah catalogue once per process as immutable records"""
+    return tuple(SurahRecord(**surah) for surah in get_surah_list(load_quran_data()))
+
+
+@st.cache_resource(show_spinner=False)
+def load_surah_labels() -> tuple:
+    """Precompute the surah selectbox labels once instead of formatting them per render"""
+    return tuple(f"{surah.id:03d} - {surah.name_en} ({surah.name_ar})" for surah in load_surah_records())
+
+
+@st.cache_data(ttl=SIDEBAR_PROGRESS_TTL, max_entries=4, show_spinner=False)
+def load_sidebar_progress(_downloader: 'QuranAudioDownloader', download_dir: str, limit: int = 5) -> tuple:
+    """Snapshot file counts for the first few surahs; the TTL spares a folder scan on every rerun"""
+    snapshot = []
+    for surah in load_surah_records()[:limit]:
+        downloaded_files = _downloader.get_surah_progress(surah.id).get('downloaded_files', 0)
+        if downloaded_files > 0:
+            snapshot.append((surah.name_en, downloaded_files))
+    return tuple(snapshot)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def list_log_files(log_dir: str, dir_mtime_ns: int) -> list:
+    """List log files; keyed on the directory mtime so it only re-scans when files come or go"""
+    with os.scandir(log_dir) as entries:
+        # is_file() comes from the directory entry itself, so this needs no per-file stat
+        return sorted(entry.name for entry in entries if entry.name.endswith('.log') and entry.is_file())
+
+
+def stat_or_none(path: str):
+    """Stat a path in one syscall, returning None when it does not exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def sample_audio_files(download_path: str, dir_mtime_ns: int, limit: int = 5) -> tuple:
+    """Return the first few audio file names and the total count from one directory scan"""
+    count = 0
+
+    def audio_names():
+        nonlocal count
+        with os.scandir(download_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(AUDIO_EXTENSION):
+                    count += 1
+                    yield entry.name
+
+    # Partial selection instead of sorting every name just to keep a handful
+    sample = heapq.nsmallest(limit, audio_names())
+    return sample, count
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def read_log_file(log_path: str, mtime_ns: int, size: int) -> str:
+    """Read a log file once per modification instead of on every rerun"""
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def read_log_tail(log_path: str, mtime_ns: int, size: int) -> list:
+    """Read only the last lines of a log by seeking near its end instead of loading the whole file"""
+    with open(log_path, 'rb') as f:
+        f.seek(max(0, size - LOG_TAIL_BYTES))
+        tail = f.read().decode('utf-8', 'replace')
+    lines = tail.splitlines()
+    if size > LOG_TAIL_BYTES:
+        lines = lines[1:]  # the first line is almost certainly cut mid-way
+    return lines[-LOG_TAIL_LINES:]
+
+
+def get_downloader_class():
+    """Import the downloader on first use so the page paints before aiohttp loads"""
+    from downloader import QuranAudioDownloader
+    return QuranAudioDownloader
 
 
 def create_downloader(download_dir: str, log_dir: str):
     """Create downloader instance"""
     try:
-        return QuranAudioDownloader(download_dir, log_dir)
+        return get_downloader_class()(download_dir, log_dir)
     except Exception as e:
         st.error(f"Failed to initialize downloader: {str(e)}")
         return None
 
 
-def enhanced_progress_callback(progress: float, current: int, total: int, message: str = "",
-                              surah_id: int = None, verse_id: int = None, word_id: int = None):
-    """progress callback for downloads"""
-    try:
-        if hasattr(st.session_state, 'download_progress'):
-            st.session_state.download_progress = progress
-            st.session_state.download_message = message
-            st.session_state.current_surah = surah_id
-            st.session_state.current_verse = verse_id
-            st.session_state.current_word = word_id
-    except Exception as e:
-        print(f"progress callback error: {e}")
+def create_progress_callback(progress_queue: queue.SimpleQueue):
+    """Create a progress callback that hands updates to the script thread through the queue"""
+    def enhanced_progress_callback(progress: float, current: int, total: int, message: str = "",
+                                   surah_id: int = None, verse_id: int = None, word_id: int = None):
+        """progress callback for downloads"""
+        progress_queue.put_nowait(('progress', (progress, current, total, message, surah_id, verse_id, word_id)))
+    return enhanced_progress_callback
 
 
-def download_surah_enhanced_async(surah_id: int, download_dir: str, download_type: str,
+def download_surah_enhanced_async(downloader: 'QuranAudioDownloader', progress_queue: queue.SimpleQueue,
+                                surah_id: int, download_dir: str, download_type: str,
                                 start_verse: int = None, end_verse: int = None,
                                 start_word: int = None, end_word: int = None,
-                                resume: bool = True):
+                                resume: bool = True, max_concurrent_downloads: int = CONCURRENT_DOWNLOADS):
     """Download surah with enhanced options in background thread"""
+    # The worker has no ScriptRunContext, so it never touches st.session_state - only the queue
     try:
-        # Create a new downloader instance in the thread
-        downloader = QuranAudioDownloader(download_dir, "logs")
-        downloader.set_progress_callback(enhanced_progress_callback)
+        # Reuse the session's downloader so its logger and connection settings carry across downloads
+        downloader.set_progress_callback(AggregatingProgressUpdater(create_progress_callback(progress_queue)))
+        downloader.set_max_concurrent_downloads(max_concurrent_downloads)
         
         # Run the download
         result = downloader.download_surah(
@@ -295,79 +219,235 @@ def download_surah_enhanced_async(surah_id: int, download_dir: str, download_typ
             end_verse=end_verse,
             start_word=start_word,
             end_word=end_word,
-            resume=resume
+            resume=resume,
+            custom_dir=download_dir
         )
         
-        # Store result in session state
-        st.session_state.download_stats = result
-        st.session_state.download_in_progress = False
-        st.session_state.download_message = "Download completed!"
+        progress_queue.put(('completed', result))
         
     except Exception as e:
+        progress_queue.put(('failed', str(e)))
+
+
+def run_download_jobs(jobs: queue.SimpleQueue, busy: threading.Event):
+    """Worker thread body: run queued downloads in order until the session's worker is collected"""
+    downloader = None
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        downloader, args = job
+        download_surah_enhanced_async(downloader, *args)
+        if jobs.empty():
+            busy.clear()
+    # Its loop and pool stay open between downloads; idle sockets expire after KEEPALIVE_TIMEOUT
+    if downloader is not None:
+        downloader.close()
+
+
+class DownloadWorker:
+    """A session's download thread; a daemon, so it never holds up interpreter exit"""
+    
+    def __init__(self):
+        self._jobs = queue.SimpleQueue()
+        self.busy = threading.Event()
+        # The thread only holds the queue and the event, so the worker itself can be collected
+        threading.Thread(target=run_download_jobs, args=(self._jobs, self.busy), name="dl", daemon=True).start()
+        # Stops the thread, closing the last downloader it ran, once the session's state is dropped
+        weakref.finalize(self, self._jobs.put, None)
+    
+    def submit(self, downloader: 'QuranAudioDownloader', *args):
+        """Queue a download_surah_enhanced_async call for the worker thread"""
+        self.busy.set()
+        self._jobs.put((downloader, args))
+
+
+def drain_progress_queue():
+    """Apply queued worker updates to session state on the script thread"""
+    progress_queue = st.session_state.progress_queue
+    latest_progress = None
+    outcome = None
+    
+    # Coalesce the whole backlog: only the newest progress event matters for display
+    while True:
+        try:
+            kind, payload = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+        
+        if kind == 'progress':
+            latest_progress = payload
+        else:
+            outcome = (kind, payload)
+    
+    if latest_progress is not None:
+        progress, current, total, message, surah_id, verse_id, word_id = latest_progress
+        st.session_state.download_progress = progress
+        st.session_state.download_message = message
+        st.session_state.download_counts = (current, total)
+        st.session_state.current_surah = surah_id
+        st.session_state.current_verse = verse_id
+        st.session_state.current_word = word_id
+    
+    # The worker posts its outcome last, so it is applied after any progress
+    if outcome is not None:
+        kind, payload = outcome
+        if kind == 'completed':
+            # Store result in session state
+            st.session_state.download_stats = payload
+            st.session_state.download_message = "Download stopped" if payload.get('stopped') else "Download completed!"
+        elif kind == 'failed':
+            st.session_state.download_message = f"Download failed: {payload}"
+
+
+def is_download_active() -> bool:
+    """Reconcile the in-progress flag with the worker so finished downloads stop polling"""
+    if st.session_state.download_in_progress and not st.session_state.download_worker.busy.is_set():
         st.session_state.download_in_progress = False
-        st.session_state.download_message = f"Download failed: {str(e)}"
+    return st.session_state.download_in_progress
+
+
+def format_progress_text() -> str:
+    """Format the progress label from raw counters once per render, not once per worker update"""
+    message = st.session_state.download_message
+    current, total = st.session_state.download_counts
+    if not total:
+        return message
+    # A plain int written by the worker thread; reading it needs no lock
+    downloaded_bytes = st.session_state.downloader.download_state.get('downloaded_bytes', 0)
+    return f"{message} - {current}/{total} files, {format_file_size(downloaded_bytes)}"
+
+
+@st.fragment(run_every=PROGRESS_UPDATE_INTERVAL)
+def render_download_progress():
+    """Render live download progress; reruns on its own without re-executing the whole app"""
+    drain_progress_queue()
+    
+    # future check - once the worker is done, rerun the full app to show the results
+    if not is_download_active():
+        st.rerun()
+
+    # One stable slot whose contents are updated in place each tick
+    placeholder = st.empty()
+
+    with placeholder.container():
+        st.progress(
+            min(st.session_state.download_progress, 100) / 100,
+            text=format_progress_text() or None
+        )
+
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            # Always emit the box so the element tree keeps the same shape between ticks
+            current_info = "Waiting for the first file..."
+            if st.session_state.current_surah:
+                current_info = f"📖 Surah {st.session_state.current_surah}"
+                if st.session_state.current_verse:
+                    current_info += f", Ayah {st.session_state.current_verse}"
+                if st.session_state.current_word:
+                    current_info += f", Word {st.session_state.current_word}"
+
+            st.markdown(
+                f"""
+                <div class="download-box">
+                    🔄 <strong>Current:</strong> {current_info}
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+        with col2:
+            status = "🟢 Active" if st.session_state.download_worker.busy.is_set() else "🔴 Inactive"
+
+            st.markdown(
+                f"""
+                <div class="status-box">
+                    <span>{status}</span>
+                    <span>⏱️ {datetime.now().strftime('%H:%M:%S')}</span>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+
+# http(s) scheme, a host, then an optional path; no whitespace anywhere
+URL_PATTERN = re.compile(r'\Ahttps?://[^/\s]+(?:/\S*)?\Z', re.IGNORECASE)
 
 
 def validate_url(url: str) -> bool:
     """Validate if URL is properly formatted"""
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
-        return False
+    return url is not None and URL_PATTERN.match(url) is not None
+
+
+def use_history_url(url: str):
+    """Make a recent URL the current one and show it in the URL input"""
+    st.session_state.current_url = url
+    st.session_state.url_input = url
 
 
 def main():
     """Main application function"""
     
+    # Stylesheet and the fixed-position footer share one markdown element
+    st.markdown(load_app_css() + FOOTER_HTML, unsafe_allow_html=True)
+    
     # Initialize session state
     initialize_session_state()
     
+    # Only poll for progress while a worker is actually running
+    drain_progress_queue()
+    is_download_active()
+    
     # FIXED: Header with proper CSS class
     st.markdown('<h1 class="main-header">🕌 Quran Audio Scraper</h1>', unsafe_allow_html=True)
 
     # FIXED: URL Input Section using Streamlit containers instead of raw HTML
     with st.container():
         
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            st.subheader("🌐 Audio URL Configuration")
-            url_input = st.text_input(
-                "Base Audio URL",
-                value=st.session_state.current_url,
-                placeholder="https://audios.quranwbw.com/words/",
-                help="Enter the base URL for audio files"
-            )
+        # One form, so editing the URL and validating it cost a single rerun on submit
+        with st.form("url_form", clear_on_submit=False, border=False):
+            col1, col2 = st.columns([3, 1])
             
+            with col1:
+                st.subheader("🌐 Audio URL Configuration")
+                url_input = st.text_input(
+                    "Base Audio URL",
+                    key="url_input",
+                    placeholder="https://audios.quranwbw.com/words/",
+                    help="Enter the base URL for audio files"
+                )
+            
+            with col2:
+                st.write("") # Spacing
+                submitted = st.form_submit_button("🔄 Validate URL", type="secondary")
+        
+        if submitted:
             if url_input != st.session_state.current_url:
                 st.session_state.current_url = url_input
-                if url_input and url_input not in st.session_state.url_history:
-                    st.session_state.url_history.append(url_input)
-        
-        with col2:
-            st.write("") # Spacing
-            if st.button("🔄 Validate URL", type="secondary"):
-                if validate_url(st.session_state.current_url):
-                    st.success("✅ URL is valid!")
-                else:
-                    st.error("❌ Invalid URL format")
+                if url_input:
+                    url_history = st.session_state.url_history
+                    # Re-entered URLs move to the newest slot; the deque bound keeps the scan at a few items
+                    if url_input in url_history:
+                        url_history.remove(url_input)
+                    url_history.append(url_input)
+            
+            if validate_url(st.session_state.current_url):
+                st.success("✅ URL is valid!")
+            else:
+                st.error("❌ Invalid URL format")
         
         # URL History
         if st.session_state.url_history:
             st.write("**Recent URLs:**")
-            for i, url in enumerate(reversed(st.session_state.url_history[-5:])):  # Show last 5
-                if st.button(f"📎 {url[:50]}{'...' if len(url) > 50 else ''}", key=f"url_{i}"):
-                    st.session_state.current_url = url
-                    st.rerun()
-
-
-    # FIXED: Footer using proper CSS class
-    st.markdown("""
-        <div class="custom-footer">
-            © 2025 Quran Audio Scraper | Powered by <a href="https://github.com/code-abdulrehman">Abdulrehman</a>
-        </div>
-    """, unsafe_allow_html=True)
+            for i, url in enumerate(reversed(st.session_state.url_history)):  # Newest first
+                # The callback runs before the script, so the click's own rerun already shows the URL
+                st.button(
+                    f"📎 {url[:50]}{'...' if len(url) > 50 else ''}",
+                    key=f"url_{i}",
+                    on_click=use_history_url,
+                    args=(url,)
+                )
     
     # Sidebar
     with st.sidebar:
@@ -380,24 +460,46 @@ def main():
             help="Directory where audio files will be downloaded"
         )
         
-        # Create downloader
-        if st.button("🚀 Initialize Downloader", type="primary"):
-            st.session_state.downloader = create_downloader(download_dir, "logs")
-            if st.session_state.downloader:
-                st.success("✅ downloader initialized successfully!")
+        max_concurrent_downloads = st.slider(
+            "⚡ Concurrent Downloads",
+            min_value=1,
+            max_value=MAX_CONCURRENT_DOWNLOADS,
+            value=CONCURRENT_DOWNLOADS,
+            help="Files fetched at once over the shared connection pool; lower it on slow or metered networks"
+        )
+        
+        # Create downloader; the running download's Stop button and byte counter use the current one
+        download_active = is_download_active()
+        if st.button("🚀 Initialize Downloader", type="primary", disabled=download_active):
+            previous = st.session_state.downloader
+            if download_active:
+                # The sidebar is drawn before Start is handled, so the button can still be enabled here
+                st.warning("⏳ Stop or wait for the running download before re-initializing.")
+            else:
+                # Re-initializing keeps the warm downloader, so its connection pool and DNS cache carry over
+                if previous is None:
+                    st.session_state.downloader = create_downloader(download_dir, "logs")
+                elif previous.download_dir != download_dir:
+                    previous.set_download_dir(download_dir)
+                if st.session_state.downloader:
+                    st.success("✅ downloader initialized successfully!")
         
         # Show current progress for any surah
         if st.session_state.downloader:
             st.markdown("### 📊 Current Progress")
             
-            # Get list of surahs with progress
-            surah_list = st.session_state.downloader.get_surah_list()
-            
             # Show progress for first few surahs as example
-            for surah in surah_list[:5]:  # Show first 5 surahs
-                progress = st.session_state.downloader.get_surah_progress(surah['id'])
-                if progress.get('downloaded_files', 0) > 0:
-                    st.write(f"**{surah['name_en']}**: {progress['downloaded_files']} files")
+            downloader = st.session_state.downloader
+            for name, downloaded_files in load_sidebar_progress(downloader, downloader.download_dir):
+                st.write(f"**{name}**: {downloaded_files} files")
+            
+            # Totals accumulated by the shared downloader across this session's runs
+            session_stats = st.session_state.downloader.get_download_stats()
+            if session_stats['total_requests'] > 0:
+                st.caption(
+                    f"Session: {session_stats['successful_downloads']} downloaded, "
+                    f"{session_stats['failed_downloads']} failed, {session_stats['formatted_size']}"
+                )
     
     # Main content
     tab1, tab2 = st.tabs(["📥 Download", "📋 Logs"])
@@ -410,8 +512,7 @@ def main():
             return
         
         # Get surah list
-        surah_list = st.session_state.downloader.get_surah_list()
-        df = pd.DataFrame(surah_list)
+        surahs = load_surah_records()
 
         with st.container():
             st.subheader("🎛️ Download Options")
@@ -444,52 +545,34 @@ def main():
             with col1:
                 selected_surah = st.selectbox(
                     "Select Surah",
-                    options=df.index,
-                    format_func=lambda x: f"{df.iloc[x]['id']:03d} - {df.iloc[x]['name_en']} ({df.iloc[x]['name_ar']})"
+                    options=range(len(surahs)),
+                    format_func=load_surah_labels().__getitem__
                 )
             
+            # Unpack the selected record once for the rest of the tab
+            surah_id, surah_name, _, ayah_count, word_count, ayah_range, word_range = surahs[selected_surah]
+            
             with col2:
-                st.metric("📖 Verses", df.iloc[selected_surah]['ayah_count'])
+                st.metric("📖 Verses", ayah_count)
             
             with col3:
-                st.metric("🔤 Words", df.iloc[selected_surah]['word_count'])
+                st.metric("🔤 Words", word_count)
             
             # Range Selection
-            surah_data = df.iloc[selected_surah]
-            ayah_range = surah_data['ayah_range']
-            word_range = surah_data['word_range']
             
             st.subheader("📊 Range Selection")
             
             col1, col2 = st.columns(2)
             
             with col1:
-                # Verse Range
-                st.write("**Verse Range:**")
-                verse_col1, verse_col2 = st.columns(2)
-                
-                with verse_col1:
-                    start_verse = st.number_input(
-                        "Start Verse",
-                        min_value=ayah_range[0],
-                        max_value=ayah_range[1],
-                        value=ayah_range[0],
-                        help=f"Starting verse (range: {ayah_range[0]}-{ayah_range[1]})"
-                    )
-                
-                with verse_col2:
-                    end_verse = st.number_input(
-                        "End Verse",
-                        min_value=ayah_range[0],
-                        max_value=ayah_range[1],
-                        value=ayah_range[1],
-                        help=f"Ending verse (range: {ayah_range[0]}-{ayah_range[1]})"
-                    )
-                
-                # Validate verse range
-                if start_verse > end_verse:
-                    st.error("Start verse cannot be greater than end verse!")
-                    return
+                # Verse Range - a range slider keeps start <= end and reruns once per change
+                start_verse, end_verse = st.slider(
+                    "Verse Range",
+                    min_value=ayah_range[0],
+                    max_value=ayah_range[1],
+                    value=(ayah_range[0], ayah_range[1]),
+                    help=f"Verses to download (range: {ayah_range[0]}-{ayah_range[1]})"
+                )
                 
                 st.session_state.download_options['start_verse'] = start_verse
                 st.session_state.download_options['end_verse'] = end_verse
@@ -497,31 +580,13 @@ def main():
             with col2:
                 # Word Range (only for word-by-word downloads)
                 if download_type == "word_by_word":
-                    st.write("**Word Range (Optional):**")
-                    word_col1, word_col2 = st.columns(2)
-                    
-                    with word_col1:
-                        start_word = st.number_input(
-                            "Start Word",
-                            min_value=1,
-                            max_value=1000,
-                            value=1,
-                            help="Starting word number (leave as 1 for all words)"
-                        )
-                    
-                    with word_col2:
-                        end_word = st.number_input(
-                            "End Word",
-                            min_value=1,
-                            max_value=1000,
-                            value=1000,
-                            help="Ending word number (leave as 1000 for all words)"
-                        )
-                    
-                    # Validate word range
-                    if start_word > end_word:
-                        st.error("Start word cannot be greater than end word!")
-                        return
+                    start_word, end_word = st.slider(
+                        "Word Range (Optional)",
+                        min_value=1,
+                        max_value=1000,
+                        value=(1, 1000),
+                        help="Word numbers to download (leave as 1-1000 for all words)"
+                    )
                     
                     st.session_state.download_options['start_word'] = start_word
                     st.session_state.download_options['end_word'] = end_word
@@ -532,9 +597,6 @@ def main():
             # Download Summary
             st.subheader("📋 Download Summary")
             
-            surah_id = surah_data['id']
-            surah_name = surah_data['name_en']
-            
             # Calculate estimated files
             if download_type == "word_by_word":
                 estimated_files = (end_verse - start_verse + 1) * 10  # Rough estimate
@@ -569,22 +631,25 @@ def main():
                 st.session_state.download_in_progress = True
                 st.session_state.download_progress = 0
                 st.session_state.download_message = "Starting enhanced download..."
+                st.session_state.download_counts = (0, 0)
+                st.session_state.current_surah = None
+                st.session_state.current_verse = None
+                st.session_state.current_word = None
                 
-                # Start download in background thread
-                thread = threading.Thread(
-                    target=download_surah_enhanced_async,
-                    args=(
-                        surah_id, download_dir, download_type,
-                        st.session_state.download_options['start_verse'],
-                        st.session_state.download_options['end_verse'],
-                        st.session_state.download_options['start_word'],
-                        st.session_state.download_options['end_word'],
-                        st.session_state.download_options['resume']
-                    )
+                # Cleared here rather than in the worker, so a Stop pressed before it starts is kept
+                st.session_state.downloader.clear_stop_request()
+                
+                # Start download on the session's worker thread
+                st.session_state.download_worker.submit(
+                    st.session_state.downloader, st.session_state.progress_queue,
+                    surah_id, download_dir, download_type,
+                    st.session_state.download_options['start_verse'],
+                    st.session_state.download_options['end_verse'],
+                    st.session_state.download_options['start_word'],
+                    st.session_state.download_options['end_word'],
+                    st.session_state.download_options['resume'],
+                    max_concurrent_downloads
                 )
-                thread.daemon = True
-                thread.start()
-                st.session_state.download_thread = thread
                 
                 st.success(f"🎯 download started for Surah {surah_id}: {surah_name}")
         
@@ -592,81 +657,13 @@ def main():
         if st.session_state.download_in_progress:
         # Named container for download progress
             with st.container():
-                st.markdown(
-                    """
-                    <style>
-                    .download-box {
-                        max-height: 150px;
-                        overflow-y: auto;
-                        padding: 0.5rem;
-                        border: 1px solid #ddd;
-                        border-radius: 8px;
-                        background: #fafafa;
-                        margin-bottom: 0.5rem;
-                    }
-                    .status-box {
-                        display: flex;
-                        justify-content: space-between;
-                        align-items: center;
-                        padding: 0.5rem;
-                        background: #f9f9f9;
-                        border-radius: 6px;
-                        border: 1px solid #ddd;
-                    }
-                    </style>
-                    """,
-                    unsafe_allow_html=True
-                )
-
-                col1, col2 = st.columns([1, 1])
-
-                with col1:
-                    if hasattr(st.session_state, "current_surah") and st.session_state.current_surah:
-                        current_info = f"📖 Surah {st.session_state.current_surah}"
-                        if getattr(st.session_state, "current_verse", None):
-                            current_info += f", Ayah {st.session_state.current_verse}"
-                        if getattr(st.session_state, "current_word", None):
-                            current_info += f", Word {st.session_state.current_word}"
-
-                        st.markdown(
-                            f"""
-                            <div class="download-box">
-                                🔄 <strong>Current:</strong> {current_info}
-                            </div>
-                            """,
-                            unsafe_allow_html=True,
-                        )
-                         # thread check
-                    if (
-                        st.session_state.download_thread
-                        and not st.session_state.download_thread.is_alive()
-                    ):
-                        st.session_state.download_in_progress = False
-
-                    # auto-refresh with spinner
-                    with st.spinner("Downloading..."):
-                        time.sleep(2)
-                        st.rerun()
-
-
-                with col2:
-                    status = "🟢 Active" if (
-                        st.session_state.download_thread
-                        and st.session_state.download_thread.is_alive()
-                    ) else "🔴 Inactive"
-
-                    st.markdown(
-                        f"""
-                        <div class="status-box">
-                            <span>{status}</span>
-                            <span>⏱️ {datetime.now().strftime('%H:%M:%S')}</span>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-
+                render_download_progress()
+                
+                # Cooperative stop: files already in flight finish, the rest of the surah is skipped
+                if st.button("🛑 Stop Download", type="secondary"):
+                    st.session_state.downloader.request_stop()
+                    st.session_state.download_message = "Stopping after the files in flight..."
 
-        
         # FIXED: Show download results using proper container
         elif st.session_state.download_stats:
             with st.container():
@@ -675,7 +672,7 @@ def main():
                 stats = st.session_state.download_stats
                 
                 # completion stats with colors
-                st.subheader("🎉 Download Completed!")
+                st.subheader("🛑 Download Stopped" if stats.get('stopped') else "🎉 Download Completed!")
                 
                 col1, col2, col3, col4 = st.columns(4)
                 
@@ -698,6 +695,10 @@ def main():
                     st.metric("⏱️ Duration", format_duration(stats['duration']))
                     st.metric("�� Type", stats['download_type'].replace('_', ' ').title())
                 
+                # Files found on disk were reused without a request, which is why repeat runs finish fast
+                if stats.get('existing_files'):
+                    st.info(f"♻️ {stats['existing_files']} of the successful files were already downloaded and reused")
+                
                 # Show download details
                 st.subheader("📊 Download Details")
                 
@@ -707,20 +708,21 @@ def main():
                 st.write(f"**Resume Enabled:** {'Yes' if st.session_state.download_options['resume'] else 'No'}")
                 
                 # Show folder structure info
-                surah_folder = f"{stats['surah_id']:03d}_{stats['surah_name'].replace(' ', '_').replace("'", '').replace('-', '_')}"
+                surah_folder = get_surah_folder_name(stats['surah_id'], stats['surah_name'])
                 download_path = os.path.join(download_dir, surah_folder)
                 
-                if os.path.exists(download_path):
+                download_path_stat = stat_or_none(download_path)
+                if download_path_stat:
                     st.success(f"📁 Files saved to: `{download_path}`")
                     
                     # Show some example files
-                    files = [f for f in os.listdir(download_path) if f.endswith('.mp3')]
+                    files, file_count = sample_audio_files(download_path, download_path_stat.st_mtime_ns)
                     if files:
                         st.write("**Sample files:**")
-                        for file in sorted(files)[:5]:  # Show first 5 files
+                        for file in files:  # Show first 5 files
                             st.write(f"  - {file}")
-                        if len(files) > 5:
-                            st.write(f"  - ... and {len(files) - 5} more files")
+                        if file_count > len(files):
+                            st.write(f"  - ... and {file_count - len(files)} more files")
                 
                 st.markdown('</div>', unsafe_allow_html=True)
     
@@ -729,8 +731,9 @@ def main():
         
         # log selection
         log_dir = "logs"
-        if os.path.exists(log_dir):
-            log_files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
+        log_dir_stat = stat_or_none(log_dir)
+        if log_dir_stat:
+            log_files = list_log_files(log_dir, log_dir_stat.st_mtime_ns)
             
             if log_files:
                 col1, col2 = st.columns([2, 1])
@@ -740,34 +743,39 @@ def main():
                     log_path = os.path.join(log_dir, selected_log)
                 
                 with col2:
-                    if os.path.exists(log_path):
-                        file_size = os.path.getsize(log_path)
-                        st.metric("📏 File Size", format_file_size(file_size))
+                    # One stat call feeds both the size metric and the content cache key
+                    # File sizes are not cached with the listing: appends do not touch the directory mtime
+                    log_stat = stat_or_none(log_path)
+                    if log_stat:
+                        st.metric("📏 File Size", format_file_size(log_stat.st_size))
                 
-                # FIXED: Display log content using proper container
-                try:
-                    with open(log_path, 'r', encoding='utf-8') as f:
-                        log_content = f.read()
+                # Only read and send the log once the user asks for it
+                if st.toggle("👁️ View Log Content", value=False):
+                    try:
+                        tail_lines = read_log_tail(log_path, log_stat.st_mtime_ns, log_stat.st_size)
+                        
+                        # FIXED: Display log content using proper container
+                        with st.container():
+                            st.markdown('<div class="log-container">', unsafe_allow_html=True)
+                            st.text("\n".join(tail_lines))
+                            st.markdown('</div>', unsafe_allow_html=True)
+                        
+                        st.caption(f"Showing up to the last {LOG_TAIL_LINES} lines")
+                        
+                        # download log button - the full file is only read for the download itself
+                        col1, col2, col3 = st.columns([1, 2, 1])
+                        with col2:
+                            st.download_button(
+                                label="📥 Download Log File",
+                                data=read_log_file(log_path, log_stat.st_mtime_ns, log_stat.st_size),
+                                file_name=selected_log,
+                                mime="text/plain",
+                                type="secondary",
+                                use_container_width=True
+                            )
                     
-                    with st.container():
-                        st.markdown('<div class="log-container">', unsafe_allow_html=True)
-                        st.text(log_content)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    # download log button
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.download_button(
-                            label="📥 Download Log File",
-                            data=log_content,
-                            file_name=selected_log,
-                            mime="text/plain",
-                            type="secondary",
-                            use_container_width=True
-                        )
-                
-                except Exception as e:
-                    st.error(f"❌ Error reading log file: {str(e)}")
+                    except Exception as e:
+                        st.error(f"❌ Error reading log file: {str(e)}")
             else:
                 st.info("📝 No log files found.")
         else:
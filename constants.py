@@ -18,11 +18,27 @@ LOG_EXTENSION = ".log"
 
 # Request settings
 MAX_RETRIES = 3
+MAX_CONSECUTIVE_404S = 5  # missing words in a row that mark the end of a verse
 TIMEOUT = 30
-CONCURRENT_DOWNLOADS = 5
+CONCURRENT_DOWNLOADS = 16  # default in-flight requests sharing one connection pool
+MAX_CONCURRENT_DOWNLOADS = 32  # upper bound offered in the sidebar
+KEEPALIVE_TIMEOUT = 30  # seconds an idle pooled connection is kept open
+DNS_CACHE_TTL = 300  # seconds a resolved audio host address is reused
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes per streamed read
+HEDGE_DELAY = 3  # seconds before a slow file is requested a second time
+RETRY_BASE_DELAY = 0.25  # seconds before the first retry; doubles on each further attempt
+RETRY_MAX_DELAY = 8  # upper bound on the backoff between retries, before jitter
+CHECKPOINT_INTERVAL = 2  # seconds between resume-state writes during a download
 
 # Progress settings
 PROGRESS_UPDATE_INTERVAL = 1  # seconds
+PROGRESS_FLUSH_INTERVAL = 0.2  # seconds between forwarded worker progress updates
+FORMAT_CACHE_SIZE = 256  # memoized size/duration labels kept by the formatters
+SIDEBAR_PROGRESS_TTL = 2  # seconds a sidebar folder-count snapshot is reused
+
+# Log viewer settings
+LOG_TAIL_LINES = 500  # lines shown in the Logs tab
+LOG_TAIL_BYTES = 256 * 1024  # bytes read from the end of a log to find those lines
 
 # Log levels
 LOG_LEVELS = {
@@ -33,6 +49,9 @@ LOG_LEVELS = {
     'CRITICAL': 50
 }
 
+# URL input settings
+URL_HISTORY_SIZE = 5  # recent base URLs kept per session
+
 # UI Messages
 MESSAGES = {
     'select_surah': 'Select a Surah to download',
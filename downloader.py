@@ -6,18 +6,22 @@ import os
 import asyncio
 import aiohttp
 import json
+import random
 import time
-from typing import List, Dict, Optional, Callable
+import threading
+from typing import List, Dict, Tuple, Optional, Callable
 from datetime import datetime
-import logging
 
 from utils import (
-    DownloadStats, setup_logging, load_quran_data, get_surah_by_id,
-    generate_audio_url, create_download_directory, download_audio_async,
-    create_audio_metadata, create_zip_file, cleanup_temp_files,
-    format_file_size, format_duration, get_download_progress
+    DownloadStats, ResumeCheckpoint, TransientDownloadError, setup_logging, load_quran_data,
+    get_surah_by_id, get_surah_list, generate_audio_url, download_audio_async, download_audio_hedged,
+    format_file_size, format_duration, get_download_progress, get_surah_folder_name
+)
+from constants import (
+    CHECKPOINT_INTERVAL, CONCURRENT_DOWNLOADS, MAX_CONCURRENT_DOWNLOADS, DEFAULT_DOWNLOAD_DIR,
+    DNS_CACHE_TTL, KEEPALIVE_TIMEOUT, MAX_CONSECUTIVE_404S, MAX_RETRIES, RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY, TIMEOUT
 )
-from constants import CONCURRENT_DOWNLOADS, DEFAULT_DOWNLOAD_DIR
 
 
 class QuranAudioDownloader:
@@ -29,7 +33,15 @@ class QuranAudioDownloader:
         self.logger = setup_logging(log_dir)
         self.quran_data = load_quran_data()
         self.stats = DownloadStats()
+        self._stats_lock = threading.Lock()  # stats are updated by the worker and read by the UI thread
         self.progress_callback: Optional[Callable] = None
+        self.max_concurrent_downloads = CONCURRENT_DOWNLOADS
+        self._stop_requested = threading.Event()  # set from the UI thread to stop a running download
+        
+        # One event loop and HTTP session for the downloader's lifetime, created lazily
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Enhanced download state tracking
         self.download_state = {
@@ -39,6 +51,7 @@ class QuranAudioDownloader:
             'total_files': 0,
             'completed_files': 0,
             'failed_files': 0,
+            'downloaded_bytes': 0,
             'start_time': None,
             'last_successful_file': None
         }
@@ -46,13 +59,51 @@ class QuranAudioDownloader:
         # Create download directory
         os.makedirs(download_dir, exist_ok=True)
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled keep-alive session, creating it on first use in the running loop"""
+        loop = asyncio.get_running_loop()
+        # aiohttp sessions are bound to the loop they were created in
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                # Sized for the largest allowed setting; the per-download semaphore applies the current one
+                limit=MAX_CONCURRENT_DOWNLOADS,
+                limit_per_host=MAX_CONCURRENT_DOWNLOADS,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=TIMEOUT)
+            )
+            self._session_loop = loop
+        return self._session
+    
     def set_progress_callback(self, callback: Callable):
         """Set progress callback function"""
         self.progress_callback = callback
     
+    def request_stop(self):
+        """Ask the running download to stop; files already in flight finish, queued ones are skipped"""
+        self._stop_requested.set()
+    
+    def clear_stop_request(self):
+        """Forget a pending stop; called when a new download is submitted, before it starts"""
+        self._stop_requested.clear()
+    
+    def set_download_dir(self, download_dir: str):
+        """Point later downloads at another folder, keeping the pooled session and its DNS cache"""
+        self.download_dir = download_dir
+        os.makedirs(download_dir, exist_ok=True)
+    
+    def set_max_concurrent_downloads(self, max_concurrent_downloads: int):
+        """Set how many files a download fetches at once, within the pooled connection limit"""
+        self.max_concurrent_downloads = max(1, min(max_concurrent_downloads, MAX_CONCURRENT_DOWNLOADS))
+    
     def _update_progress(self, current: int, total: int, message: str = "", 
                         surah_id: int = None, verse_id: int = None, word_id: int = None):
         """Enhanced progress update with detailed information"""
+        # Plain int stores the UI can read and format itself, instead of a formatted string per file
+        self.download_state['current_verse'] = verse_id
+        self.download_state['current_word'] = word_id
         if self.progress_callback:
             try:
                 progress = get_download_progress(current, total)
@@ -60,26 +111,73 @@ class QuranAudioDownloader:
             except Exception as e:
                 self.logger.error(f"Progress callback error: {e}")
     
+    def _merge_stats(self, result: Dict):
+        """Fold a finished download into the cumulative session statistics"""
+        # Files reused from disk were neither requested nor transferred, so only fresh ones count
+        fetched_size = result['total_size'] - result['existing_size']
+        with self._stats_lock:
+            self.stats.total_requests += result['total_files'] - result['existing_files']
+            self.stats.successful_downloads += result['successful_downloads'] - result['existing_files']
+            self.stats.failed_downloads += result['failed_downloads']
+            self.stats.total_size += fetched_size
+            self.stats.end()
+            if result['duration'] > 0 and fetched_size > 0:
+                self.stats.add_speed_sample(fetched_size / result['duration'] / 1024 / 1024)
+    
     def _get_surah_folder_name(self, surah_id: int, surah_name: str) -> str:
         """Generate folder name for surah"""
-        return f"{surah_id:03d}_{surah_name.replace(' ', '_').replace("'", '').replace('-', '_')}"
+        return get_surah_folder_name(surah_id, surah_name)
     
-    def _get_file_path(self, surah_id: int, surah_name: str, verse_id: int, word_id: int = None) -> str:
-        """Generate file path for audio file with folder structure"""
-        surah_folder = self._get_surah_folder_name(surah_id, surah_name)
-        surah_path = os.path.join(self.download_dir, surah_folder)
-        os.makedirs(surah_path, exist_ok=True)
-        
+    def _get_file_name(self, surah_id: int, verse_id: int, word_id: int = None) -> str:
+        """Generate the file name of an audio file; the caller resolves its surah folder once"""
         if word_id:
-            filename = f"{surah_id:03d}_{verse_id:03d}_{word_id:03d}.mp3"
-        else:
-            filename = f"{surah_id:03d}_{verse_id:03d}_verse.mp3"
-        
-        return os.path.join(surah_path, filename)
+            return f"{surah_id:03d}_{verse_id:03d}_{word_id:03d}.mp3"
+        return f"{surah_id:03d}_{verse_id:03d}_verse.mp3"
     
-    def _check_file_exists(self, file_path: str) -> bool:
-        """Check if file already exists and has content"""
-        return os.path.exists(file_path) and os.path.getsize(file_path) > 0
+    def _scan_surah_dir(self, surah_path: str, names: set) -> Dict[str, int]:
+        """Map the requested files that exist in a surah folder, with content, to their sizes"""
+        try:
+            with os.scandir(surah_path) as entries:
+                # Only requested names are stat'ed; other files in the folder cost one listing entry
+                return {
+                    entry.name: size for entry in entries
+                    if entry.name in names and entry.is_file() and (size := entry.stat().st_size) > 0
+                }
+        except FileNotFoundError:
+            return {}
+    
+    def _scan_existing(self, surah_id: int, surah_path: str, wanted: Dict, total_files: int) -> Tuple[List, int, int]:
+        """Split the wanted files into those still to download and those already on disk
+        
+        wanted maps each file's key to its name, in queue order. Returns the missing keys
+        in that order, plus the count and total size of the files that are reused.
+        """
+        # One listing of the surah folder replaces two stat calls per file for the skip check
+        existing_sizes = self._scan_surah_dir(surah_path, set(wanted.values()))
+        missing = [key for key, filename in wanted.items() if filename not in existing_sizes]
+        existing_files = len(wanted) - len(missing)
+        
+        # Files already on disk are tallied here in one go instead of each getting a coroutine
+        if existing_files:
+            self.download_state['completed_files'] += existing_files
+            self.logger.info(f"Skipping {existing_files} files that already exist")
+            self._update_progress(self.download_state['completed_files'], total_files, "Already exists", surah_id)
+        return missing, existing_files, sum(existing_sizes.values())
+    
+    async def _checkpoint(self, surah_id: int, resume_point: ResumeCheckpoint, force: bool = False):
+        """Save the first unfinished file for resume, at most every CHECKPOINT_INTERVAL unless forced"""
+        now = time.monotonic()
+        if not force and now - resume_point.saved_at < CHECKPOINT_INTERVAL:
+            return
+        resume_point.saved_at = now
+        async with resume_point.lock:
+            # Write off the loop, unless that point already reached disk
+            position, resume_from = resume_point.position, resume_point.resume_from
+            if position > resume_point.saved_position and resume_from is not None:
+                # Word keys are (verse, word) pairs, verse keys bare verse ids
+                location = resume_from if isinstance(resume_from, tuple) else (resume_from,)
+                await asyncio.to_thread(self._save_download_state, surah_id, *location)
+                resume_point.saved_position = position
     
     def _save_download_state(self, surah_id: int, verse_id: int, word_id: int = None):
         """Save current download state for resume functionality"""
@@ -122,43 +220,47 @@ class QuranAudioDownloader:
         total_words = word_range[1] - word_range[0] + 1
         
         # Calculate words per ayah (approximate)
-        words_per_ayah = total_words // total_ayahs
-        
-        ayah_word_mapping = {}
+        words_per_ayah, remaining_words = divmod(total_words, total_ayahs)
         
-        for ayah_id in range(ayah_range[0], ayah_range[1] + 1):
-            # For the last ayah, include all remaining words
-            if ayah_id == ayah_range[1]:
-                words_in_ayah = total_words - (words_per_ayah * (total_ayahs - 1))
-            else:
-                words_in_ayah = words_per_ayah
-            
-            ayah_word_mapping[ayah_id] = words_in_ayah
+        ayah_word_mapping = dict.fromkeys(range(ayah_range[0], ayah_range[1] + 1), words_per_ayah)
+        # The last ayah also takes the words that do not divide evenly
+        ayah_word_mapping[ayah_range[1]] += remaining_words
         
         return ayah_word_mapping
     
     async def _download_word_with_retry(self, session: aiohttp.ClientSession, 
                                       surah_id: int, verse_id: int, word_id: int,
-                                      file_path: str, max_retries: int = 3) -> tuple[bool, int]:
-        """Download a single word with retry logic and 404 handling"""
+                                      file_path: str, max_retries: int = MAX_RETRIES,
+                                      semaphore: Optional[asyncio.Semaphore] = None) -> tuple[bool, int]:
+        """Download a single word with retry logic and 404 handling
+        
+        The first attempt may be hedged using a free slot of the download's semaphore;
+        retries already follow a failure, so they go out on their own.
+        """
+        url = generate_audio_url(surah_id, verse_id, word_id)
         for attempt in range(max_retries):
             try:
-                url = generate_audio_url(surah_id, verse_id, word_id)
-                success, size = await download_audio_async(session, url, file_path, self.logger)
+                if attempt == 0:
+                    success, size = await download_audio_hedged(
+                        session, url, file_path, self.logger, hedge_slots=semaphore
+                    )
+                else:
+                    success, size = await download_audio_async(session, url, file_path, self.logger)
                 
                 if success:
                     return True, size
                 else:
-                    # Check if it's a 404 error (file doesn't exist)
-                    if attempt == 0:  # Only log on first attempt
-                        self.logger.warning(f"Word {surah_id:03d}_{verse_id:03d}_{word_id:03d} not found (404)")
+                    # A definitive answer such as a 404; the HTTP status is logged by the download itself
+                    self.logger.warning(f"Word {surah_id:03d}_{verse_id:03d}_{word_id:03d} is not available")
                     return False, 0
                     
-            except Exception as e:
+            except TransientDownloadError as e:
                 self.logger.error(f"Attempt {attempt + 1} failed for {surah_id:03d}_{verse_id:03d}_{word_id:03d}: {e}")
                 if attempt == max_retries - 1:
                     return False, 0
-                await asyncio.sleep(1)  # Wait before retry
+                # Exponential backoff with jitter, so files that failed together do not retry in lockstep
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
         
         return False, 0
     
@@ -167,7 +269,7 @@ class QuranAudioDownloader:
                                   start_verse: int = None, end_verse: int = None,
                                   start_word: int = None, end_word: int = None,
                                   resume: bool = True) -> Dict:
-        """FIXED: Download word by word with proper 404 handling and verse progression"""
+        """Download word by word, fetching words concurrently over the shared session"""
         
         # Load previous state if resuming
         if resume:
@@ -201,14 +303,86 @@ class QuranAudioDownloader:
             'total_files': total_files,
             'completed_files': 0,
             'failed_files': 0,
+            'downloaded_bytes': 0,
             'start_time': time.time()
         })
         
         successful_downloads = 0
         failed_downloads = 0
         total_size = 0
+        semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        # Resolve and create the surah folder once; each file then only needs its name built
+        surah_path = os.path.join(self.download_dir, self._get_surah_folder_name(surah_id, surah_name))
+        os.makedirs(surah_path, exist_ok=True)
+        # Words past a verse's real end are missing on the server, so a run of misses ends the verse
+        verse_misses: Dict[int, set] = {}
+        verse_ends: Dict[int, int] = {}
+        verse_tasks: Dict[int, Dict[int, asyncio.Task]] = {}  # unfinished word tasks of each verse
         
-        # FIXED: Download words with proper error handling
+        async def download_word(verse_id: int, word_id: int, file_path: str):
+            nonlocal successful_downloads, failed_downloads, total_size, total_files
+            
+            # Bound the number of in-flight requests sharing the session's connection pool
+            async with semaphore:
+                if self._stop_requested.is_set():
+                    return
+                success, size = await self._download_word_with_retry(
+                    session, surah_id, verse_id, word_id, file_path, semaphore=semaphore
+                )
+            verse_tasks[verse_id].pop(word_id, None)
+            
+            if success:
+                successful_downloads += 1
+                total_size += size
+                self.download_state['completed_files'] += 1
+                self.download_state['downloaded_bytes'] += size
+                self.download_state['last_successful_file'] = file_path
+                self.logger.info(f"Downloaded: {surah_id:03d}_{verse_id:03d}_{word_id:03d}")
+            else:
+                failed_downloads += 1
+                self.download_state['failed_files'] += 1
+                self.logger.warning(f"Failed to download: {surah_id:03d}_{verse_id:03d}_{word_id:03d}")
+                
+                # Words finish out of order, so look for the run of misses on both sides of this one
+                misses = verse_misses.setdefault(verse_id, set())
+                misses.add(word_id)
+                first_miss = last_miss = word_id
+                while first_miss - 1 in misses:
+                    first_miss -= 1
+                while last_miss + 1 in misses:
+                    last_miss += 1
+                run_length = last_miss - first_miss + 1
+                if run_length >= MAX_CONSECUTIVE_404S and last_miss < verse_ends.get(verse_id, last_miss + 1):
+                    verse_ends[verse_id] = last_miss
+                    self.logger.info(
+                        f"Too many consecutive 404s ({run_length}) for verse {verse_id}, "
+                        f"skipping its words after {last_miss}"
+                    )
+                    # Cancel the verse's later words, whether still queued or already in flight
+                    later_words = [
+                        later for later, task in verse_tasks[verse_id].items()
+                        if later > last_miss and not task.done()
+                    ]
+                    for later_word in later_words:
+                        verse_tasks[verse_id].pop(later_word).cancel()
+                        resume_point.finish((verse_id, later_word))
+                    # Cancelled words are left out of the total, so progress still reaches 100%
+                    total_files -= len(later_words)
+                    self.download_state['total_files'] -= len(later_words)
+            resume_point.finish((verse_id, word_id))
+            # A stopped download flushes the latest checkpoint below
+            await self._checkpoint(surah_id, resume_point)
+            
+            # Update progress
+            self._update_progress(
+                self.download_state['completed_files'], 
+                total_files,
+                "Downloading",
+                surah_id, verse_id, word_id
+            )
+        
+        # Every file in the requested range, in queue order
+        wanted = {}
         for verse_id, word_count in ayah_word_mapping.items():
             if start_verse and verse_id < start_verse:
                 continue
@@ -218,66 +392,39 @@ class QuranAudioDownloader:
             verse_start_word = start_word if verse_id == start_verse else 1
             verse_end_word = end_word if verse_id == end_verse else word_count
             
-            self.logger.info(f"Processing verse {verse_id}: words {verse_start_word}-{verse_end_word}")
-            
-            # Track consecutive 404 errors for this verse
-            consecutive_404s = 0
-            max_consecutive_404s = 5  # Stop trying after 5 consecutive 404s
+            self.logger.info(f"Queueing verse {verse_id}: words {verse_start_word}-{verse_end_word}")
             
             for word_id in range(verse_start_word, verse_end_word + 1):
-                # Check if file already exists
-                file_path = self._get_file_path(surah_id, surah_name, verse_id, word_id)
-                
-                if self._check_file_exists(file_path):
-                    self.logger.info(f"File already exists: {file_path}")
-                    successful_downloads += 1
-                    total_size += os.path.getsize(file_path)
-                    self.download_state['completed_files'] += 1
-                    consecutive_404s = 0  # Reset 404 counter
-                    self._update_progress(
-                        self.download_state['completed_files'], 
-                        total_files,
-                        f"Already exists: {surah_id:03d}_{verse_id:03d}_{word_id:03d}",
-                        surah_id, verse_id, word_id
-                    )
-                    continue
-                
-                # Try to download the word
-                success, size = await self._download_word_with_retry(session, surah_id, verse_id, word_id, file_path)
-                
-                if success:
-                    successful_downloads += 1
-                    total_size += size
-                    self.download_state['completed_files'] += 1
-                    self.download_state['last_successful_file'] = file_path
-                    consecutive_404s = 0  # Reset 404 counter
-                    
-                    # Save state for resume
-                    self._save_download_state(surah_id, verse_id, word_id)
-                    
-                    self.logger.info(f"Downloaded: {surah_id:03d}_{verse_id:03d}_{word_id:03d}")
-                else:
-                    failed_downloads += 1
-                    self.download_state['failed_files'] += 1
-                    consecutive_404s += 1
-                    
-                    self.logger.warning(f"Failed to download: {surah_id:03d}_{verse_id:03d}_{word_id:03d}")
-                    
-                    # FIXED: If we get too many consecutive 404s, move to next verse
-                    if consecutive_404s >= max_consecutive_404s:
-                        self.logger.info(f"Too many consecutive 404s ({consecutive_404s}) for verse {verse_id}, moving to next verse")
-                        break  # Break out of word loop, move to next verse
-                
-                # Update progress
-                self._update_progress(
-                    self.download_state['completed_files'], 
-                    total_files,
-                    f"Downloading: {surah_id:03d}_{verse_id:03d}_{word_id:03d}",
-                    surah_id, verse_id, word_id
-                )
+                wanted[(verse_id, word_id)] = self._get_file_name(surah_id, verse_id, word_id)
+        
+        queued, existing_files, existing_bytes = self._scan_existing(surah_id, surah_path, wanted, total_files)
+        successful_downloads += existing_files
+        total_size += existing_bytes
+        
+        tasks = []
+        for verse_id, word_id in queued:
+            file_path = os.path.join(surah_path, wanted[(verse_id, word_id)])
+            task = asyncio.create_task(download_word(verse_id, word_id, file_path))
+            verse_tasks.setdefault(verse_id, {})[word_id] = task
+            tasks.append(task)
+        # Resume from the first word not yet finished, never from the newest finished one
+        resume_point = ResumeCheckpoint(queued)
+        
+        # Fan out all words at once; return_exceptions keeps one failure from cancelling the rest
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for key, result in zip(queued, results):
+            if isinstance(result, Exception):
+                failed_downloads += 1
+                self.download_state['failed_files'] += 1
+                resume_point.finish(key)
+                self.logger.error(f"Word download task failed: {result}")
+        
+        # A stopped download keeps its state file, so record where it has to pick up again
+        if self._stop_requested.is_set():
+            await self._checkpoint(surah_id, resume_point, force=True)
         
-        # Clean up state file on completion
-        if successful_downloads > 0:
+        # Clean up state file on completion; a stopped download keeps it so it can resume
+        if successful_downloads > 0 and not self._stop_requested.is_set():
             state_file = os.path.join(self.download_dir, f"download_state_{surah_id}.json")
             if os.path.exists(state_file):
                 try:
@@ -295,6 +442,8 @@ class QuranAudioDownloader:
             'total_files': total_files,
             'successful_downloads': successful_downloads,
             'failed_downloads': failed_downloads,
+            'existing_files': existing_files,
+            'existing_size': existing_bytes,
             'total_size': total_size,
             'duration': duration,
             'start_verse': start_verse,
@@ -307,7 +456,7 @@ class QuranAudioDownloader:
                                     surah_id: int, surah_name: str,
                                     start_verse: int = None, end_verse: int = None,
                                     resume: bool = True) -> Dict:
-        """Download verse by verse with resume functionality"""
+        """Download verse by verse with resume functionality, fetching verses concurrently"""
         
         # Load previous state if resuming
         if resume:
@@ -334,68 +483,80 @@ class QuranAudioDownloader:
             'current_surah': surah_id,
             'total_files': total_files,
             'completed_files': 0,
-            'failed_downloads': 0,
+            'failed_files': 0,
+            'downloaded_bytes': 0,
             'start_time': time.time()
         })
         
         successful_downloads = 0
         failed_downloads = 0
         total_size = 0
+        semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        # Resolve and create the surah folder once; each file then only needs its name built
+        surah_path = os.path.join(self.download_dir, self._get_surah_folder_name(surah_id, surah_name))
+        os.makedirs(surah_path, exist_ok=True)
         
-        # Download verses
-        for verse_id in range(start_verse, end_verse + 1):
-            # Check if file already exists
-            file_path = self._get_file_path(surah_id, surah_name, verse_id)
+        async def download_verse(verse_id: int, file_path: str):
+            nonlocal successful_downloads, failed_downloads, total_size
             
-            if self._check_file_exists(file_path):
-                self.logger.info(f"Verse file already exists: {file_path}")
-                successful_downloads += 1
-                total_size += os.path.getsize(file_path)
-                self.download_state['completed_files'] += 1
-                self._update_progress(
-                    self.download_state['completed_files'],
-                    total_files,
-                    f"Already exists: Verse {verse_id}",
-                    surah_id, verse_id
+            async with semaphore:
+                if self._stop_requested.is_set():
+                    return
+                # For verse-by-verse, we'll use the first word URL as the verse URL
+                success, size = await self._download_word_with_retry(
+                    session, surah_id, verse_id, 1, file_path, semaphore=semaphore
                 )
-                continue
             
-            # For verse-by-verse, we'll use the first word URL as the verse URL
-            url = generate_audio_url(surah_id, verse_id, 1)
+            if success:
+                successful_downloads += 1
+                total_size += size
+                self.download_state['completed_files'] += 1
+                self.download_state['downloaded_bytes'] += size
+                self.download_state['last_successful_file'] = file_path
+                self.logger.info(f"Downloaded verse: {verse_id}")
+            else:
+                failed_downloads += 1
+                self.download_state['failed_files'] += 1
+                self.logger.warning(f"Failed to download verse: {verse_id}")
+            resume_point.finish(verse_id)
+            # A stopped download flushes the latest checkpoint below
+            await self._checkpoint(surah_id, resume_point)
             
-            try:
-                success, size = await download_audio_async(session, url, file_path, self.logger)
-                
-                if success:
-                    successful_downloads += 1
-                    total_size += size
-                    self.download_state['completed_files'] += 1
-                    self.download_state['last_successful_file'] = file_path
-                    
-                    # Save state for resume
-                    self._save_download_state(surah_id, verse_id)
-                    
-                    self.logger.info(f"Downloaded verse: {verse_id}")
-                else:
-                    failed_downloads += 1
-                    self.download_state['failed_files'] += 1
-                    self.logger.warning(f"Failed to download verse: {verse_id}")
-                
-                # Update progress
-                self._update_progress(
-                    self.download_state['completed_files'],
-                    total_files,
-                    f"Downloading verse: {verse_id}",
-                    surah_id, verse_id
-                )
-                
-            except Exception as e:
+            # Update progress
+            self._update_progress(
+                self.download_state['completed_files'],
+                total_files,
+                "Downloading",
+                surah_id, verse_id
+            )
+        
+        wanted = {
+            verse_id: self._get_file_name(surah_id, verse_id)
+            for verse_id in range(start_verse, end_verse + 1)
+        }
+        queued, existing_files, existing_bytes = self._scan_existing(surah_id, surah_path, wanted, total_files)
+        successful_downloads += existing_files
+        total_size += existing_bytes
+        
+        tasks = [download_verse(verse_id, os.path.join(surah_path, wanted[verse_id])) for verse_id in queued]
+        # Resume from the first verse not yet finished, never from the newest finished one
+        resume_point = ResumeCheckpoint(queued)
+        
+        # Download the missing verses concurrently over the shared session
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for verse_id, result in zip(queued, results):
+            if isinstance(result, Exception):
                 failed_downloads += 1
                 self.download_state['failed_files'] += 1
-                self.logger.error(f"Error downloading verse {verse_id}: {e}")
+                resume_point.finish(verse_id)
+                self.logger.error(f"Error downloading verse: {result}")
+        
+        # A stopped download keeps its state file, so record where it has to pick up again
+        if self._stop_requested.is_set():
+            await self._checkpoint(surah_id, resume_point, force=True)
         
-        # Clean up state file on completion
-        if successful_downloads > 0:
+        # Clean up state file on completion; a stopped download keeps it so it can resume
+        if successful_downloads > 0 and not self._stop_requested.is_set():
             state_file = os.path.join(self.download_dir, f"download_state_{surah_id}.json")
             if os.path.exists(state_file):
                 try:
@@ -413,6 +574,8 @@ class QuranAudioDownloader:
             'total_files': total_files,
             'successful_downloads': successful_downloads,
             'failed_downloads': failed_downloads,
+            'existing_files': existing_files,
+            'existing_size': existing_bytes,
             'total_size': total_size,
             'duration': duration,
             'start_verse': start_verse,
@@ -437,29 +600,37 @@ class QuranAudioDownloader:
         surah_name = surah['name_en']
         self.logger.info(f"Starting {download_type} download for Surah {surah_id}: {surah_name}")
         
+        with self._stats_lock:
+            if self.stats.start_time is None:
+                self.stats.start()
+        
         # Use custom directory if provided
         if custom_dir:
-            self.download_dir = custom_dir
-            os.makedirs(custom_dir, exist_ok=True)
-        
-        # Create async session
-        connector = aiohttp.TCPConnector(limit=CONCURRENT_DOWNLOADS)
-        timeout = aiohttp.ClientTimeout(total=30)
-        
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            if download_type == 'word_by_word':
-                result = await self.download_word_by_word(
-                    session, surah_id, surah_name, start_verse, end_verse, 
-                    start_word, end_word, resume
-                )
-            elif download_type == 'verse_by_verse':
-                result = await self.download_verse_by_verse(
-                    session, surah_id, surah_name, start_verse, end_verse, resume
-                )
-            else:
-                raise ValueError(f"Invalid download type: {download_type}")
+            self.set_download_dir(custom_dir)
+        
+        # Reuse the downloader's warm keep-alive pool across downloads
+        session = self._get_session()
+        
+        if download_type == 'word_by_word':
+            result = await self.download_word_by_word(
+                session, surah_id, surah_name, start_verse, end_verse, 
+                start_word, end_word, resume
+            )
+        elif download_type == 'verse_by_verse':
+            result = await self.download_verse_by_verse(
+                session, surah_id, surah_name, start_verse, end_verse, resume
+            )
+        else:
+            raise ValueError(f"Invalid download type: {download_type}")
         
-        self.logger.info(f"Download completed: {result['successful_downloads']} successful, {result['failed_downloads']} failed")
+        result['stopped'] = self._stop_requested.is_set()
+        # The stop only applied to this download; the next one starts fresh
+        self.clear_stop_request()
+        self.logger.info(
+            f"Download {'stopped' if result['stopped'] else 'completed'}: "
+            f"{result['successful_downloads']} successful, {result['failed_downloads']} failed"
+        )
+        self._merge_stats(result)
         
         return result
     
@@ -468,46 +639,61 @@ class QuranAudioDownloader:
                       start_word: int = None, end_word: int = None,
                       resume: bool = True, custom_dir: Optional[str] = None) -> Dict:
         """Enhanced synchronous wrapper for download"""
-        return asyncio.run(self.download_surah_enhanced_async(
+        # Keep one event loop for the downloader's lifetime so its pooled session stays usable
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.download_surah_enhanced_async(
             surah_id, download_type, start_verse, end_verse, start_word, end_word, resume, custom_dir
         ))
     
+    def close(self):
+        """Close the pooled HTTP session and the downloader's event loop"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        if self._session is not None and not self._session.closed:
+            self._loop.run_until_complete(self._session.close())
+        self._loop.close()
+        self._session = None
+
+    async def aclose(self):
+        """Close the pooled HTTP session from inside the caller's running loop"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     def get_surah_list(self) -> List[Dict]:
         """Get list of all surahs with enhanced information"""
-        return [
-            {
-                'id': surah['surah_id'],
-                'name_en': surah['name_en'],
-                'name_ar': surah['name_ar'],
-                'ayah_count': surah['ayah_range'][1] - surah['ayah_range'][0] + 1,
-                'word_count': surah['word_range'][1] - surah['word_range'][0] + 1,
-                'ayah_range': surah['ayah_range'],
-                'word_range': surah['word_range']
-            }
-            for surah in self.quran_data
-        ]
+        return get_surah_list(self.quran_data)
     
     def get_download_stats(self) -> Dict:
         """Get current download statistics"""
-        return {
-            'current_surah': self.download_state.get('current_surah'),
-            'current_verse': self.download_state.get('current_verse'),
-            'current_word': self.download_state.get('current_word'),
-            'total_files': self.download_state.get('total_files', 0),
-            'completed_files': self.download_state.get('completed_files', 0),
-            'failed_files': self.download_state.get('failed_files', 0),
-            'last_successful_file': self.download_state.get('last_successful_file'),
-            'start_time': self.download_state.get('start_time'),
-            'total_requests': self.stats.total_requests,
-            'successful_downloads': self.stats.successful_downloads,
-            'failed_downloads': self.stats.failed_downloads,
-            'total_size': self.stats.total_size,
-            'formatted_size': format_file_size(self.stats.total_size),
-            'duration': self.stats.get_duration(),
-            'formatted_duration': format_duration(self.stats.get_duration()),
-            'speed': self.stats.get_speed(),
-            'average_speed': self.stats.get_average_speed()
-        }
+        with self._stats_lock:
+            return {
+                'current_surah': self.download_state.get('current_surah'),
+                'current_verse': self.download_state.get('current_verse'),
+                'current_word': self.download_state.get('current_word'),
+                'total_files': self.download_state.get('total_files', 0),
+                'completed_files': self.download_state.get('completed_files', 0),
+                'failed_files': self.download_state.get('failed_files', 0),
+                'downloaded_bytes': self.download_state.get('downloaded_bytes', 0),
+                'last_successful_file': self.download_state.get('last_successful_file'),
+                'start_time': self.download_state.get('start_time'),
+                'total_requests': self.stats.total_requests,
+                'successful_downloads': self.stats.successful_downloads,
+                'failed_downloads': self.stats.failed_downloads,
+                'total_size': self.stats.total_size,
+                'formatted_size': format_file_size(self.stats.total_size),
+                'duration': self.stats.get_duration(),
+                'formatted_duration': format_duration(self.stats.get_duration()),
+                'speed': self.stats.get_speed(),
+                'average_speed': self.stats.get_average_speed()
+            }
     
     def get_surah_progress(self, surah_id: int) -> Dict:
         """Get progress for a specific surah"""
@@ -6,21 +6,35 @@ import os
 import json
 import zipfile
 import logging
-import requests
 import asyncio
-import aiohttp
 from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-from tqdm import tqdm
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional, Callable
+from collections import namedtuple
+from functools import lru_cache
 import time
-import numpy as np
 
 from constants import (
-    AUDIO_URL_TEMPLATE, AUDIO_EXTENSION, ZIP_EXTENSION, JSON_EXTENSION,
-    MAX_RETRIES, TIMEOUT, CONCURRENT_DOWNLOADS, DEFAULT_DOWNLOAD_DIR
+    AUDIO_URL_TEMPLATE, AUDIO_EXTENSION, TIMEOUT,
+    DOWNLOAD_CHUNK_SIZE, HEDGE_DELAY, PROGRESS_FLUSH_INTERVAL, FORMAT_CACHE_SIZE
 )
 
+# The HTTP clients are imported by the functions that use them, so the UI's helpers load without them
+if TYPE_CHECKING:
+    import aiohttp
+
+
+# Lightweight immutable row for the static surah catalogue
+SurahRecord = namedtuple(
+    'SurahRecord', 'id name_en name_ar ayah_count word_count ayah_range word_range'
+)
+
+# Folder-name sanitization in one pass: spaces and hyphens become underscores, apostrophes are dropped
+_FOLDER_NAME_TABLE = str.maketrans({' ': '_', "'": None, '-': '_'})
+
+
+class TransientDownloadError(Exception):
+    """A download failed for a reason worth retrying: rate limiting, a server error, or a network fault"""
+
 
 class DownloadStats:
     """class to track download statistics"""
@@ -63,6 +77,53 @@ class DownloadStats:
         return 0
 
 
+class AggregatingProgressUpdater:
+    """Coalesce progress callbacks so at most one update is forwarded per flush interval"""
+    
+    def __init__(self, callback: Callable, flush_interval: float = PROGRESS_FLUSH_INTERVAL):
+        self.callback = callback
+        self.flush_interval = flush_interval
+        self.last_flush_time = 0.0
+    
+    def __call__(self, progress: float, current: int, total: int, *args):
+        now = time.monotonic()
+        # Always forward the final update so the UI never stalls just short of 100%
+        if now - self.last_flush_time >= self.flush_interval or current >= total:
+            self.last_flush_time = now
+            self.callback(progress, current, total, *args)
+
+
+class ResumeCheckpoint:
+    """Track the first file, in queue order, that has not finished downloading yet
+    
+    Concurrent downloads finish out of order, so the newest finished file can be ahead of
+    earlier ones still in flight; resuming from this low-water mark never skips those.
+    """
+    
+    def __init__(self, queue_order: List):
+        self.queue_order = queue_order
+        self.position = 0  # index of the first unfinished file
+        self._finished_ahead = set()
+        # Bookkeeping for whoever persists the checkpoint; the lock keeps writes landing in order
+        self.saved_position = 0
+        self.saved_at = 0.0
+        self.lock = asyncio.Lock()
+    
+    def finish(self, key):
+        """Mark a file as done, successfully or not, and advance past every finished file in a row"""
+        self._finished_ahead.add(key)
+        while self.position < len(self.queue_order) and self.queue_order[self.position] in self._finished_ahead:
+            self._finished_ahead.remove(self.queue_order[self.position])
+            self.position += 1
+    
+    @property
+    def resume_from(self):
+        """The first unfinished file, or None once every file has finished"""
+        if self.position < len(self.queue_order):
+            return self.queue_order[self.position]
+        return None
+
+
 def setup_logging(log_dir: str = "logs") -> logging.Logger:
     """Setup logging configuration"""
     
@@ -115,6 +176,22 @@ def get_surah_by_id(surah_id: int, quran_data: List[Dict]) -> Optional[Dict]:
     return None
 
 
+def get_surah_list(quran_data: List[Dict]) -> List[Dict]:
+    """Get list of all surahs with enhanced information"""
+    return [
+        {
+            'id': surah['surah_id'],
+            'name_en': surah['name_en'],
+            'name_ar': surah['name_ar'],
+            'ayah_count': surah['ayah_range'][1] - surah['ayah_range'][0] + 1,
+            'word_count': surah['word_range'][1] - surah['word_range'][0] + 1,
+            'ayah_range': surah['ayah_range'],
+            'word_range': surah['word_range']
+        }
+        for surah in quran_data
+    ]
+
+
 def generate_audio_url(surah_id: int, ayah_id: int, word_id: int) -> str:
     """Generate audio URL for specific word using correct QuranWBW structure"""
     # For QuranWBW, the folder ID is typically the same as surah_id
@@ -138,22 +215,22 @@ def create_download_directory(base_dir: str, surah_id: int) -> str:
 
 def create_enhanced_download_directory(base_dir: str, surah_id: int, surah_name: str) -> str:
     """Create enhanced download directory with surah name"""
-    surah_folder = f"{surah_id:03d}_{surah_name.replace(' ', '_').replace("'", '').replace('-', '_')}"
-    surah_dir = os.path.join(base_dir, surah_folder)
+    surah_dir = os.path.join(base_dir, get_surah_folder_name(surah_id, surah_name))
     os.makedirs(surah_dir, exist_ok=True)
     return surah_dir
 
 
 def download_audio_file(url: str, file_path: str, logger: logging.Logger) -> bool:
     """Download a single audio file"""
+    import requests
     try:
-        response = requests.get(url, timeout=TIMEOUT, stream=True)
-        response.raise_for_status()
-        
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        with requests.get(url, timeout=TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            
+            with open(file_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
         
         return True
     except requests.exceptions.RequestException as e:
@@ -164,29 +241,110 @@ def download_audio_file(url: str, file_path: str, logger: logging.Logger) -> boo
         return False
 
 
-async def download_audio_async(session: aiohttp.ClientSession, url: str, file_path: str, logger: logging.Logger) -> Tuple[bool, int]:
-    """Download a single audio file asynchronously with better error handling"""
+async def download_audio_async(session: 'aiohttp.ClientSession', url: str, file_path: str, logger: logging.Logger,
+                               temp_suffix: str = '.part') -> Tuple[bool, int]:
+    """Download a single audio file asynchronously with better error handling
+    
+    Returns (False, 0) for a definitive failure such as a 404, and raises
+    TransientDownloadError when a retry could succeed.
+    """
+    import aiohttp
+    temp_path = file_path + temp_suffix
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=TIMEOUT)) as response:
             if response.status == 200:
-                content = await response.read()
-                with open(file_path, 'wb') as f:
-                    f.write(content)
-                return True, len(content)
+                # Audio files are small, so collect the body and hand the disk work to a thread in one go
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    chunks.append(chunk)
+                    size += len(chunk)
             elif response.status == 404:
                 logger.warning(f"HTTP 404 for {url}")
                 return False, 0
+            elif response.status == 429 or response.status >= 500:
+                logger.warning(f"HTTP {response.status} for {url}")
+                raise TransientDownloadError(f"HTTP {response.status} for {url}")
             else:
                 logger.warning(f"HTTP {response.status} for {url}")
                 return False, 0
-    except aiohttp.ClientError as e:
+        
+        # Written after the response is released, so its pooled connection serves the next request meanwhile
+        await asyncio.to_thread(_write_audio_file, file_path, temp_path, chunks)
+        return True, size
+    except TransientDownloadError:
+        raise
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"Client error downloading {url}: {str(e)}")
-        return False, 0
+        _remove_partial_file(temp_path)
+        raise TransientDownloadError(f"{type(e).__name__} for {url}: {e}") from e
     except Exception as e:
         logger.error(f"Failed to download {url}: {str(e)}")
+        _remove_partial_file(temp_path)
         return False, 0
 
 
+async def download_audio_hedged(session: 'aiohttp.ClientSession', url: str, file_path: str, logger: logging.Logger,
+                                hedge_delay: float = HEDGE_DELAY,
+                                hedge_slots: Optional[asyncio.Semaphore] = None) -> Tuple[bool, int]:
+    """Download a file, racing a second request when the first is slower than hedge_delay
+    
+    With hedge_slots, the second request is only sent when that semaphore has a free slot,
+    and holds it while running, so hedging never exceeds the caller's concurrency limit.
+    """
+    attempts = [asyncio.create_task(download_audio_async(session, url, file_path, logger))]
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=hedge_delay)
+        if not done and (hedge_slots is None or not hedge_slots.locked()):
+            if hedge_slots is not None:
+                # Returns at once since a slot is free; the hedge gives it back when it ends
+                await hedge_slots.acquire()
+            # Its own temp file, so the two transfers never write over each other
+            hedge = asyncio.create_task(
+                download_audio_async(session, url, file_path, logger, temp_suffix='.hedge')
+            )
+            if hedge_slots is not None:
+                hedge.add_done_callback(lambda _: hedge_slots.release())
+            attempts.append(hedge)
+        
+        result = (False, 0)
+        error = None
+        answered = False
+        for attempt in asyncio.as_completed(attempts):
+            try:
+                result = await attempt
+            except TransientDownloadError as e:
+                # The other request may still get through
+                error = e
+                continue
+            answered = True
+            if result[0]:
+                break
+        # Only worth a retry when no request got a definitive answer
+        if not answered and error is not None:
+            raise error
+        return result
+    finally:
+        # Drop the slower request once either one has succeeded (no-op for finished attempts)
+        for attempt in attempts:
+            attempt.cancel()
+
+
+def _write_audio_file(file_path: str, temp_path: str, chunks: List[bytes]):
+    """Write a downloaded body to a temp file, then rename it so a partial write never looks finished"""
+    with open(temp_path, 'wb') as f:
+        f.writelines(chunks)
+    os.replace(temp_path, file_path)
+
+
+def _remove_partial_file(temp_path: str):
+    """Remove a partially written download, ignoring files that never got created"""
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+
+
 def create_audio_metadata(surah_id: int, ayah_id: int, word_id: int, audio_file: str) -> Dict:
     """Create metadata for audio file - ensure all values are JSON serializable"""
     return {
@@ -202,7 +360,8 @@ def create_zip_file(surah_dir: str, surah_id: int, metadata: List[Dict], logger:
     zip_path = os.path.join(os.path.dirname(surah_dir), f"surah_{surah_id:03d}.zip")
     
     try:
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        # MP3 is already compressed, so audio entries are stored as-is instead of deflated again
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
             # Add all audio files
             for root, dirs, files in os.walk(surah_dir):
                 for file in files:
@@ -223,7 +382,7 @@ def create_zip_file(surah_dir: str, surah_id: int, metadata: List[Dict], logger:
                 serializable_metadata.append(serializable_item)
             
             metadata_json = json.dumps(serializable_metadata, indent=2, ensure_ascii=False)
-            zipf.writestr("metadata.json", metadata_json)
+            zipf.writestr("metadata.json", metadata_json, compress_type=zipfile.ZIP_DEFLATED)
         
         logger.info(f"Created ZIP file: {zip_path}")
         return zip_path
@@ -242,6 +401,8 @@ def cleanup_temp_files(surah_dir: str, logger: logging.Logger):
         logger.error(f"Failed to cleanup temp files: {str(e)}")
 
 
+# Reruns keep formatting the same sizes and durations; bounded so live counters cannot grow it
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
     if size_bytes == 0:
@@ -256,6 +417,7 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} {size_names[i]}"
 
 
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def format_duration(seconds: float) -> str:
     """Format duration in human readable format"""
     if seconds < 60:
@@ -344,7 +506,7 @@ def cleanup_download_state(download_dir: str, surah_id: int) -> bool:
 
 def get_surah_folder_name(surah_id: int, surah_name: str) -> str:
     """Generate standardized folder name for surah"""
-    return f"{surah_id:03d}_{surah_name.replace(' ', '_').replace("'", '').replace('-', '_')}"
+    return f"{surah_id:03d}_{surah_name.translate(_FOLDER_NAME_TABLE)}"
 
 
 def get_audio_file_path(download_dir: str, surah_id: int, surah_name: str, verse_id: int, word_id: int = None) -> str: